@@ -4,12 +4,21 @@ Data Cleaner - Transforms and standardizes data.
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+NULL_VALUES = ["", "nan", "None", "none", "null", "NULL", "N/A", "n/a", "NA"]
+NULL_ARRAY = np.array(NULL_VALUES, dtype=object)
 
 
 '''
-Convert list columns to comma-separated strings. This method iterates through
-all columsn and converts a list into a comma-separated string. Doesn't change 
-values that aren't lists.
+Convert list columns to comma-separated strings. Arrow list columns are
+joined with a pyarrow compute kernel; lists whose items can't be cast to
+strings (such as lists of structs or nested lists) are joined in Python
+with str() of each item instead. Object columns are only scanned when
+pandas' type inference (a single C pass) reports mixed values, which
+includes columns mixing lists and strings. Doesn't change values that
+aren't lists.
 
 Args:
     df: Input DataFrame with list columns
@@ -19,28 +28,45 @@ Returns:
 '''
 def flatten_lists(df):
     for col in df.columns:
-        if df[col].apply(lambda x: isinstance(x, list)).any():
-            df[col] = df[col].apply(
-                lambda x: ", ".join(str(i) for i in x) if isinstance(x, list) else x
-            )
+        dtype = df[col].dtype
+        if isinstance(dtype, pd.ArrowDtype) and pa.types.is_list(dtype.pyarrow_dtype):
+            values = pa.array(df[col])
+            try:
+                joined = pc.binary_join(values.cast(pa.list_(pa.string())), ", ")
+            except (pa.ArrowNotImplementedError, pa.ArrowInvalid):
+                df[col] = [
+                    ", ".join(map(str, x)) if isinstance(x, list) else x
+                    for x in values.to_pylist()
+                ]
+                continue
+            df[col] = pd.Series(pd.arrays.ArrowExtensionArray(joined), index=df.index)
+    
+    for col in df.select_dtypes(include="object").columns:
+        # Lists only show up in columns pandas infers as mixed
+        if pd.api.types.infer_dtype(df[col], skipna=True) not in ("mixed", "mixed-integer"):
+            continue
+        df[col] = [
+            ", ".join(map(str, x)) if isinstance(x, list) else x
+            for x in df[col].to_numpy()
+        ]
     return df
 
 '''
 Only keeps columns that are defined in the schema and the DataFrame. Any extra
-columns from the API response are discarded.
+columns from the API response are discarded. Uses a hash-based Index
+intersection, which keeps the DataFrame's column order.
 
 Args:
     df: Dataframe
     schema: A dictionary that maps column names to data types
 '''
 def filter_columns(df, schema):
-    schema_cols = list(schema.keys())
-    cols_to_keep = [col for col in df.columns if col in schema_cols]
-    return df[cols_to_keep].copy()
+    cols_to_keep = df.columns.intersection(list(schema), sort=False)
+    return df.loc[:, cols_to_keep]
 
 '''
 Strip leading and trailing whitespace from string columns. Non-string
-columns aren't affected.
+columns and non-string values such as NaN aren't affected.
 
 Args:  
     df: DataFrame
@@ -49,14 +75,18 @@ Returns:
     A DataFrame with whitespace stripped from string values.
 '''
 def strip_strings(df):
-    for col in df.columns:
-        if df[col].dtype == "object":
-            df[col] = df[col].astype(str).str.strip()
+    for col in df.select_dtypes(include=["object", "string"]).columns:
+        is_str = df[col].map(type).eq(str)
+        if is_str.all():
+            df[col] = df[col].str.strip()
+        elif is_str.any():
+            df.loc[is_str, col] = df.loc[is_str, col].str.strip()
     return df
 
 '''
 Normalize null values to NaN. We convert all possible null representations
-to pandas NaN values for consistent null handling.
+to pandas NaN values for consistent null handling. Each string column is
+matched against the sentinels with a single numpy.isin call.
 
 Args:
     df: Input DataFrame
@@ -66,16 +96,38 @@ Returns:
 '''
 def normalize_nulls(df):
     """Normalize various null representations to NaN."""
-    null_values = ["", "nan", "None", "none", "null", "NULL", "N/A", "n/a", "NA"]
-    for col in df.columns:
-        if df[col].dtype == "object":
-            df[col] = df[col].replace(null_values, np.nan)
+    for col in df.select_dtypes(include=["object", "string"]).columns:
+        values = df[col].to_numpy(dtype=object, na_value=None)
+        df[col] = df[col].mask(np.isin(values, NULL_ARRAY))
+    return df
+
+'''
+Strip whitespace and normalize null values in a single pass. String columns
+are converted once to the pyarrow-backed string dtype, stripped, and any null
+representation is replaced with NA. Gives the same result as strip_strings
+followed by normalize_nulls without walking the Python objects twice.
+
+Args:
+    df: Input DataFrame
+
+Returns:
+    A DataFrame with stripped strings and normalized null values.
+'''
+def strip_and_normalize(df):
+    str_cols = df.select_dtypes(include=["object", "string"]).columns
+    for col in str_cols:
+        stripped = df[col].astype("string[pyarrow]").str.strip()
+        df[col] = stripped.mask(stripped.isin(NULL_VALUES), pd.NA)
     return df
 
 '''
 Remove duplicate records based on the primary key. Resets indexes at 
 the end since when you remove rows, pandas keeps the original index 
-numbers which leaves gaps.
+numbers which leaves gaps; an index that is already 0..n-1 is kept as is.
+A single integer key is deduplicated with numpy.unique; other string,
+Arrow or numeric keys are combined into one 64-bit hash per row and
+deduplicated on that. Object keys use drop_duplicates, because hashing
+converts object values to str and would merge keys such as 1 and "1".
 
 Args:
     df: Input DataFrame
@@ -86,8 +138,22 @@ Returns:
 def remove_duplicates(df, pk):
     if pk:
         existing_pk = [col for col in pk if col in df.columns]
-        if existing_pk:
+        key = df[existing_pk[0]] if len(existing_pk) == 1 else None
+        if key is not None and pd.api.types.is_integer_dtype(key) and not key.hasnans:
+            # Index of the first occurrence in the reversed array is the
+            # last occurrence in the original order
+            values = key.to_numpy()
+            _, last = np.unique(values[::-1], return_index=True)
+            df = df.iloc[np.sort(len(values) - 1 - last)]
+        elif existing_pk and not any(df[col].dtype == object for col in existing_pk):
+            hashes = pd.util.hash_pandas_object(df[existing_pk], index=False)
+            duplicated = hashes.duplicated(keep="last").to_numpy()
+            if duplicated.any():
+                df = df[~duplicated]
+        elif existing_pk:
             df = df.drop_duplicates(subset=existing_pk, keep="last")
+    if df.index.equals(pd.RangeIndex(len(df))):
+        return df
     return df.reset_index(drop=True)
 
 '''
@@ -97,14 +163,71 @@ Args:
     df: Input DataFrame
     schema: Dictionary that maps column names to data types
     pk: List of primary keys needed to remove duplicates
+    backend: "pandas" (default) or "polars" to run the steps as one lazy
+        Polars query
 
 Returns:
     Cleaned DataFrame that is ready for validation.
 '''
-def clean_data(df, schema, pk):
-    df = flatten_lists(df)
+def clean_data(df, schema, pk, backend="pandas"):
+    if backend == "polars":
+        return clean_data_polars(df, schema, pk)
+    if backend != "pandas":
+        raise ValueError(f"Unknown clean backend: {backend}")
+    
     df = filter_columns(df, schema)
-    df = strip_strings(df)
-    df = normalize_nulls(df)
+    df = flatten_lists(df)
+    df = strip_and_normalize(df)
     df = remove_duplicates(df, pk)
     return df
+
+'''
+Apply all cleaning steps as a single lazy Polars query. Only schema columns
+are converted to Polars; object columns, which may mix lists and scalars,
+are flattened and converted to strings first. List columns are joined,
+strings are stripped and null representations are replaced in one
+projection, then duplicates are removed by primary key. The plan is
+collected once and returned as pandas so validation and loading work
+unchanged. Requires polars to be installed.
+
+Args:
+    df: Input DataFrame
+    schema: Dictionary that maps column names to data types
+    pk: List of primary keys needed to remove duplicates
+
+Returns:
+    Cleaned DataFrame that is ready for validation.
+'''
+def clean_data_polars(df, schema, pk):
+    import polars as pl
+    
+    cols_to_keep = [col for col in df.columns if col in schema]
+    df = df.loc[:, cols_to_keep]
+    
+    # Polars can't convert object columns that mix lists or types, so those
+    # are flattened and converted to strings in pandas, as clean_data does
+    mixed = df.select_dtypes(include="object").columns
+    if len(mixed):
+        df[mixed] = flatten_lists(df.loc[:, mixed]).astype("string[pyarrow]")
+    
+    lf = pl.from_pandas(df).lazy()
+    
+    exprs = []
+    for col, dtype in lf.collect_schema().items():
+        if isinstance(dtype, pl.List):
+            value = pl.col(col).cast(pl.List(pl.String)).list.join(", ")
+        elif dtype == pl.String:
+            value = pl.col(col)
+        else:
+            continue
+        value = value.str.strip_chars()
+        exprs.append(
+            pl.when(value.is_in(NULL_VALUES)).then(None).otherwise(value).alias(col)
+        )
+    lf = lf.with_columns(exprs)
+    
+    existing_pk = [col for col in pk if col in cols_to_keep] if pk else []
+    if existing_pk:
+        lf = lf.unique(subset=existing_pk, keep="last", maintain_order=True)
+    
+    return lf.collect().to_pandas()
@@ -6,6 +6,12 @@ import os
 import yaml
 from dotenv import load_dotenv
 
+# Use the libyaml C parser when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 '''
 Load configuration from YAML file.
 Reads YAML configuration file, extracts default settings and source definitions.
@@ -15,19 +21,25 @@ Args:
     config_path: The path to the YAML configuration file.
 
 Returns:
-    A dictionary containing the database URL, batch size and a list of sources.
+    A dictionary containing the database URL, batch size, COPY threshold,
+    cleaning backend, whether to downcast int columns, number of sources
+    processed concurrently and a list of sources.
 '''
 def load_config(config_path):
     """Load configuration from YAML file."""
     load_dotenv()
     
-    with open(config_path, "r") as f:
-        data = yaml.safe_load(f)
+    with open(config_path, "rb") as f:
+        data = yaml.load(f, Loader=SafeLoader)
     
     defaults = data.get("defaults", {})
     
     return {
         "db_url": os.getenv("DATABASE_URL", defaults.get("db_url", "")),
         "batch_size": defaults.get("batch_size", 5000),
+        "copy_threshold": defaults.get("copy_threshold", 1024),
+        "clean_backend": defaults.get("clean_backend", "pandas"),
+        "downcast_numeric": defaults.get("downcast_numeric", False),
+        "max_workers": defaults.get("max_workers", 4),
         "sources": data.get("sources", []),
     }
@@ -4,120 +4,284 @@ Main Pipeline - Orchestrates the ETL process.
 
 import sys
 import logging
+import logging.handlers
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+import pandas as pd
+
+# Copy-on-Write for the whole run, so frames passed between the clean,
+# validate and load steps share memory until one of them is modified
+pd.options.mode.copy_on_write = True
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config import load_config
-from readers import fetch_data
-from clean import clean_data
+from readers import fetch_data_iter
+from clean import clean_data, flatten_lists, filter_columns, remove_duplicates
 from validate import validate_data
-from load import create_loader, load_data, load_rejects, init_database
+from load import create_loader, load_data, load_data_copy, load_data_sql_clean, load_rejects, init_database
 
-# Setup logging
+# Setup logging. Log calls only enqueue the record; a listener thread
+# writes it to the console and log file off the pipeline threads.
+log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(
+    log_queue,
+    logging.StreamHandler(),
+    logging.FileHandler("pipeline.log", delay=True),
+)
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler("pipeline.log"),
-    ]
+    handlers=[logging.handlers.QueueHandler(log_queue)],
 )
 logger = logging.getLogger(__name__)
 
 
 '''
-Runs the full ingestion pipeline. It loads configuration,
-initializes database tables, iterates through each source to extract, clean,
-validate, and load data into PostgreSQL. It also keeps track of and logs 
-statistics for each source and produces a final summary.
+Iterates over items produced by a background thread. The thread runs ahead
+of the consumer by up to maxsize items, so fetching the next page overlaps
+with processing the current one. Errors raised by the producer are re-raised
+in the consumer. If the consumer exits early the producer stops and closes
+the iterable, so a generator's cleanup runs without waiting for it to finish.
 
 Args:
-    config_path: Path to the YAML configuration file.
-    init_db: If True, drop and recreate database tables before running.
+    iterable: Iterable to consume on the background thread.
+    maxsize: Maximum number of items buffered ahead of the consumer.
+
+Yields:
+    Items of the iterable in order.
 '''
-def run_pipeline(config_path, init_db=False):
-    pipeline_start = time.time()
-    config = load_config(config_path)
-    engine = create_loader(config["db_url"])
+def _prefetch(iterable, maxsize=2):
+    buffer = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    done = object()
     
-    if init_db:
-        init_database(engine)
+    def put(item, error=None):
+        while not stop.is_set():
+            try:
+                buffer.put((item, error), timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
     
-    logger.info(f"Pipeline started - Processing {len(config['sources'])} sources")
-    logger.info("=" * 60)
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except Exception as e:
+            put(done, e)
+            return
+        finally:
+            close = getattr(iterable, "close", None)
+            if close is not None:
+                close()
+        put(done)
     
-    # Pipeline totals
-    total_input = 0
-    total_valid = 0
-    total_rejected = 0
-    total_inserted = 0
-    sources_succeeded = 0
-    sources_failed = 0
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if error is not None:
+                raise error
+            if item is done:
+                return
+            yield item
+    finally:
+        stop.set()
+
+'''
+Loads buffered valid rows and rejects on one connection and transaction.
+The valid frames are combined and deduplicated by primary key, keeping the
+last row, so a key seen on several pages is written once with its latest
+valid version and the COPY upsert never sees the same key twice. At least
+copy_threshold combined rows are loaded through COPY, fewer through
+executemany.
+
+Args:
+    frames: Valid DataFrames buffered since the last load, in page order.
+    rejects: Rejects of the same pages.
+    engine: SQLAlchemy database engine shared by all sources.
+    source: Source definition from the configuration.
+    config: Pipeline configuration returned by load_config.
+
+Returns:
+    Number of records inserted/updated.
+'''
+def _load_buffered(frames, rejects, engine, source, config):
+    table, pk = source["target_table"], source["pk"]
+    df = remove_duplicates(pd.concat(frames, ignore_index=True), pk) if frames else pd.DataFrame()
     
-    for source in config["sources"]:
-        name = source["name"]
-        source_start = time.time()
-        status = "SUCCESS"
-        
-        try:
-            # Extract
-            df = fetch_data(source["path"], pages=10)
+    with engine.begin() as conn:
+        if len(df) >= config["copy_threshold"]:
+            inserted = load_data_copy(df, engine, table, pk, conn=conn)
+        else:
+            inserted = load_data(df, engine, table, pk, config["batch_size"], conn=conn)
+        load_rejects(rejects, engine, conn=conn)
+    return inserted
+
+'''
+Runs extract, clean, validate and load for a single source and logs its
+summary. Pages are processed as they arrive and row counts are summed
+across pages. Besides the page being processed, only a bounded number of
+pages is held in memory: those buffered by _prefetch and those being
+fetched by the reader's window. Valid rows and rejects are buffered until
+at least copy_threshold valid rows have accumulated and are then loaded
+together (see _load_buffered), so large sources reach the COPY path even
+when each page is small. Pages are validated on their own: a key repeated
+on a later page is validated again, and if that version fails validation
+it is rejected while the valid row from the earlier page is still loaded.
+Sources with clean_in_db set skip pandas cleaning and validation and are
+cleaned by PostgreSQL during the load instead. Errors are logged rather
+than raised so one failing source doesn't stop the others.
+
+Args:
+    source: Source definition from the configuration.
+    engine: SQLAlchemy database engine shared by all sources.
+    config: Pipeline configuration returned by load_config.
+
+Returns:
+    A dictionary of row counts for the source and whether it succeeded.
+'''
+def _process_source(source, engine, config):
+    name = source["name"]
+    source_start = time.time()
+    stats = {"input": 0, "valid": 0, "rejected": 0, "inserted": 0, "succeeded": False}
+    valid_frames, buffered_rejects, buffered = [], [], 0
+    
+    try:
+        # Extract one page at a time while the previous page is processed
+        for df in _prefetch(fetch_data_iter(source["path"], pages=10)):
+            stats["input"] += len(df)
             
-            if df.empty:
-                logger.warning(f"[{name}] No data fetched, skipping...")
-                sources_failed += 1
+            if source.get("clean_in_db"):
+                # Strip, normalize nulls and dedup in PostgreSQL while loading
+                df = flatten_lists(filter_columns(df, source["schema"]))
+                with engine.begin() as conn:
+                    inserted = load_data_sql_clean(
+                        df, engine, source["target_table"], source["pk"], source["schema"], conn=conn
+                    )
+                stats["valid"] += inserted
+                stats["inserted"] += inserted
                 continue
             
-            input_rows = len(df)
-            total_input += input_rows
-            
             # Clean
-            df = clean_data(df, source["schema"], source["pk"])
+            df = clean_data(df, source["schema"], source["pk"], config["clean_backend"])
             
             # Validate
-            valid_df, rejects = validate_data(df, name, source["schema"], source["rules"])
-            valid_count = len(valid_df)
-            rejected_count = len(rejects)
-            total_valid += valid_count
-            total_rejected += rejected_count
-            
-            # Load
-            inserted = load_data(valid_df, engine, source["target_table"], source["pk"])
-            load_rejects(rejects, engine)
-            total_inserted += inserted
+            valid_df, rejects = validate_data(
+                df, name, source["schema"], source["rules"], config["downcast_numeric"]
+            )
+            stats["valid"] += len(valid_df)
+            stats["rejected"] += sum(len(batch) for batch in rejects)
             
-            source_duration = time.time() - source_start
-            sources_succeeded += 1
-            
-            # Source summary
-            logger.info(f"[{name}] Input: {input_rows} | Valid: {valid_count} | Rejected: {rejected_count} | Inserted: {inserted} | Duration: {source_duration:.2f}s | Status: {status}")
-            
-        except Exception as e:
-            status = "FAILED"
-            sources_failed += 1
-            source_duration = time.time() - source_start
-            logger.error(f"[{name}] Error: {e} | Duration: {source_duration:.2f}s | Status: {status}")
-    
-    # Pipeline summary
-    pipeline_duration = time.time() - pipeline_start
-    pipeline_status = "SUCCESS" if sources_failed == 0 else "PARTIAL" if sources_succeeded > 0 else "FAILED"
-    
-    logger.info("=" * 60)
-    logger.info("PIPELINE SUMMARY")
-    logger.info("=" * 60)
-    logger.info(f"Total Input Rows:    {total_input}")
-    logger.info(f"Valid Records:       {total_valid}")
-    logger.info(f"Rejected Records:    {total_rejected}")
-    logger.info(f"Inserted Records:    {total_inserted}")
-    logger.info(f"Sources Succeeded:   {sources_succeeded}")
-    logger.info(f"Sources Failed:      {sources_failed}")
-    logger.info(f"Total Duration:      {pipeline_duration:.2f}s")
-    logger.info(f"Pipeline Status:     {pipeline_status}")
-    logger.info("=" * 60)
+            # Buffer valid rows until there are enough to load through COPY
+            if len(valid_df):
+                valid_frames.append(valid_df)
+                buffered += len(valid_df)
+            buffered_rejects.extend(rejects)
+            if buffered >= config["copy_threshold"]:
+                stats["inserted"] += _load_buffered(
+                    valid_frames, buffered_rejects, engine, source, config
+                )
+                valid_frames, buffered_rejects, buffered = [], [], 0
+        
+        if valid_frames or buffered_rejects:
+            stats["inserted"] += _load_buffered(
+                valid_frames, buffered_rejects, engine, source, config
+            )
+        
+        if stats["input"] == 0:
+            logger.warning(f"[{name}] No data fetched, skipping...")
+            return stats
+        
+        source_duration = time.time() - source_start
+        stats["succeeded"] = True
+        
+        # Source summary
+        logger.info(f"[{name}] Input: {stats['input']} | Valid: {stats['valid']} | Rejected: {stats['rejected']} | Inserted: {stats['inserted']} | Duration: {source_duration:.2f}s | Status: SUCCESS")
+        
+    except Exception as e:
+        source_duration = time.time() - source_start
+        logger.error(f"[{name}] Error: {e} | Duration: {source_duration:.2f}s | Status: FAILED")
     
-    engine.dispose()
+    return stats
+
+'''
+Runs the full ingestion pipeline. It loads configuration,
+initializes database tables, and processes the sources concurrently on a
+thread pool to extract, clean, validate, and load data into PostgreSQL.
+Sources are HTTP and database bound, so running them on threads overlaps
+their network waits; at most max_workers sources run at once. Workers
+share one engine, which is safe because the engine's connection pool is
+thread-safe and each source checks out its own connection for its
+transaction. It also keeps track of and logs statistics for each source
+and produces a final summary. The log listener thread runs for the
+duration of the call and is flushed before returning.
+
+Args:
+    config_path: Path to the YAML configuration file.
+    init_db: If True, drop and recreate database tables before running.
+'''
+def run_pipeline(config_path, init_db=False):
+    log_listener.start()
+    try:
+        pipeline_start = time.time()
+        config = load_config(config_path)
+        engine = create_loader(config["db_url"])
+        
+        if init_db:
+            init_database(engine)
+        
+        sources = config["sources"]
+        logger.info(f"Pipeline started - Processing {len(sources)} sources")
+        logger.info("=" * 60)
+        
+        # Pipeline totals
+        total_input = 0
+        total_valid = 0
+        total_rejected = 0
+        total_inserted = 0
+        sources_succeeded = 0
+        sources_failed = 0
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(config["max_workers"], len(sources)))) as executor:
+            futures = [executor.submit(_process_source, source, engine, config) for source in sources]
+            for future in as_completed(futures):
+                stats = future.result()
+                total_input += stats["input"]
+                total_valid += stats["valid"]
+                total_rejected += stats["rejected"]
+                total_inserted += stats["inserted"]
+                if stats["succeeded"]:
+                    sources_succeeded += 1
+                else:
+                    sources_failed += 1
+        
+        # Pipeline summary
+        pipeline_duration = time.time() - pipeline_start
+        pipeline_status = "SUCCESS" if sources_failed == 0 else "PARTIAL" if sources_succeeded > 0 else "FAILED"
+        
+        logger.info("=" * 60)
+        logger.info("PIPELINE SUMMARY")
+        logger.info("=" * 60)
+        logger.info(f"Total Input Rows:    {total_input}")
+        logger.info(f"Valid Records:       {total_valid}")
+        logger.info(f"Rejected Records:    {total_rejected}")
+        logger.info(f"Inserted Records:    {total_inserted}")
+        logger.info(f"Sources Succeeded:   {sources_succeeded}")
+        logger.info(f"Sources Failed:      {sources_failed}")
+        logger.info(f"Total Duration:      {pipeline_duration:.2f}s")
+        logger.info(f"Pipeline Status:     {pipeline_status}")
+        logger.info("=" * 60)
+        
+        engine.dispose()
+    finally:
+        log_listener.stop()
 
 
 if __name__ == "__main__":
@@ -1 +1 @@
-from readers.api_reader import fetch_data
+from readers.api_reader import fetch_data, fetch_data_iter
@@ -2,15 +2,232 @@
 API Reader - Fetches data from REST endpoints.
 """
 
+import re
 import time
+import threading
+import orjson
 import requests
 import pandas as pd
+import pyarrow as pa
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+HEADERS = {"User-Agent": "DataIngestionPipeline/1.0"}
+
+# Maximum number of pages of one source fetched at the same time
+MAX_PAGE_WORKERS = 4
+
+# Column type for string fields on both the Arrow and the fallback path
+ARROW_STRING = pd.ArrowDtype(pa.string())
+
+# Runs of whitespace and dashes in a column name, replaced by one underscore
+_WS_OR_DASH = re.compile(r"[-\s]+")
+
+'''
+Creates the HTTP session shared by all requests. Connections are kept in a
+pool and reused across pages and sources instead of opening a new TCP and
+TLS connection per request. Gateway errors are retried with backoff.
+
+Returns:
+    A requests Session with pooled, retrying adapters mounted.
+'''
+def _create_session():
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+_session = _create_session()
+
+# Earliest start time of the next request, shared by every source so that
+# sources fetched in parallel don't multiply the request rate
+_throttle_lock = threading.Lock()
+_next_start = 0.0
+
+'''
+Spaces out request start times across all sources. Each call blocks until
+at least delay seconds have passed since the previous caller was let
+through, so concurrent page fetches, from one source or from several, stay
+as polite as sequential ones.
+
+Args:
+    delay: minimum seconds between request starts
+'''
+def _throttle(delay):
+    global _next_start
+    with _throttle_lock:
+        now = time.monotonic()
+        start = max(now, _next_start)
+        _next_start = start + delay
+    time.sleep(start - now)
+
+'''
+Fetches a single page of results from a REST API endpoint. Failed requests
+are reported and treated as an empty page so the remaining pages can still
+be fetched.
+
+Args:
+    url: API endpoint URL
+    page: page number to fetch
+    pages: total number of pages being fetched, used for progress output
+
+Returns:
+    A list of records from the page's "docs" field.
+'''
+def _fetch_page(url, page, pages):
+    page_url = f"{url}&page={page}"
+    print(f"  Fetching page {page}/{pages}...")
+    
+    try:
+        response = _session.get(page_url, timeout=30)
+        response.raise_for_status()
+        return orjson.loads(response.content).get("docs", [])
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+        print(f"  Warning: Failed to fetch page {page}: {e}")
+        return []
+
+'''
+Builds an Arrow table from a page of records in one columnar pass. Strings
+become contiguous Arrow buffers and list fields Arrow list columns instead
+of Python objects. pa.array is used rather than Table.from_pylist because it
+takes the union of keys across all records.
+
+Args:
+    docs: List of record dictionaries
+
+Returns:
+    A pyarrow Table. Raises pa.ArrowInvalid or pa.ArrowTypeError when a
+    field mixes types.
+'''
+def _to_table(docs):
+    return pa.Table.from_struct_array(pa.array(docs))
+
+'''
+Builds a DataFrame from a page of records through pandas, for pages that
+can't be converted to Arrow directly. Columns holding only strings are
+converted to the Arrow string type used by _to_table and the rest get
+pyarrow dtypes where they can be inferred.
+
+Args:
+    docs: List of record dictionaries
+
+Returns:
+    A DataFrame, with mixed-type columns left as object.
+'''
+def _to_pandas_frame(docs):
+    df = pd.DataFrame(docs)
+    for col in df.select_dtypes(include="object").columns:
+        if pd.api.types.infer_dtype(df[col], skipna=True) == "string":
+            df[col] = df[col].astype(ARROW_STRING)
+    return df.convert_dtypes(dtype_backend="pyarrow")
+
+'''
+Builds a DataFrame from a page of records. Every column keeps its Arrow type
+(see _to_table); pages whose fields mix types fall back to _to_pandas_frame.
+
+Args:
+    docs: List of record dictionaries
+
+Returns:
+    A DataFrame with pyarrow-backed columns.
+'''
+def _to_frame(docs):
+    try:
+        table = _to_table(docs)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return _to_pandas_frame(docs)
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+'''
+Normalizes a column name to lower case, replacing each run of whitespace or
+dashes with a single underscore.
+'''
+def _normalize_name(name):
+    return _WS_OR_DASH.sub("_", str(name).strip().lower())
+
+'''
+Normalizes column names with _normalize_name.
+
+Args:
+    df: DataFrame built from API records
+
+Returns:
+    The DataFrame with normalized column names.
+'''
+def _normalize_columns(df):
+    df.columns = [_normalize_name(c) for c in df.columns]
+    return df
+
+'''
+Fetches the records of each page of a REST API endpoint. Up to
+MAX_PAGE_WORKERS pages are requested concurrently so their network latency
+overlaps, with request starts still spaced delay seconds apart (see
+_throttle). Pages are submitted in a sliding window, so at most
+MAX_PAGE_WORKERS pages are fetched or waiting ahead of the consumer. Pages
+that fail or return no records are skipped.
+
+Args:
+    url: API endpoint URL
+    pages: number of pages to fetch
+    delay: seconds to wait between requests
+
+Yields:
+    The list of record dictionaries of each page, in page order.
+'''
+def _iter_pages(url, pages, delay):
+    def fetch(page):
+        _throttle(delay)
+        return _fetch_page(url, page, pages)
+    
+    workers = max(1, min(MAX_PAGE_WORKERS, pages))
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = deque()
+    next_page = 1
+    try:
+        while pending or next_page <= pages:
+            while next_page <= pages and len(pending) < workers:
+                pending.append(executor.submit(fetch, next_page))
+                next_page += 1
+            docs = pending.popleft().result()
+            if docs:
+                yield docs
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+'''
+Fetches data from a REST API endpoint page by page. Yields a DataFrame per
+page in page order so callers can process each page while later ones are
+fetched (see _iter_pages). Columns use pyarrow-backed dtypes (see _to_frame).
+
+Args:
+    url: API endpoint URL
+    pages: number of pages to fetch
+    delay: seconds to wait between requests
+
+Yields:
+    A DataFrame per page with normalized column names.
+'''
+def fetch_data_iter(url, pages=1, delay=1.0):
+    for docs in _iter_pages(url, pages, delay):
+        yield _normalize_columns(_to_frame(docs))
 
 '''
 Fetches data from a REST API endpoint. Makes HTTP GET requests to the
 specified URL, handling multiple pages of results. It includes error handling
 to continue in case a request fails. It also normalizes column names to lower case
-with underscores.
+with underscores. Each page is kept as an Arrow table with normalized column
+names and the pages are concatenated in Arrow, promoting columns missing
+from some pages to null, so pandas only builds the combined DataFrame once.
+If any page can't be represented in Arrow the pages are combined with
+pandas instead.
 
 Args:
     url: API endpoint URL
@@ -22,39 +239,30 @@ Returns:
     If the requests to all pages fails then it will return an empty DataFrame.
 '''
 def fetch_data(url, pages=1, delay=1.0):
-    all_data = []
-    headers = {"User-Agent": "DataIngestionPipeline/1.0"}
-    
-    for page in range(1, pages + 1):
-        page_url = f"{url}&page={page}"
-        print(f"  Fetching page {page}/{pages}...")
-        
+    # Names are normalized per page so keys that only differ in case,
+    # spacing or dashes end up in the same column
+    parts = []
+    for docs in _iter_pages(url, pages, delay):
         try:
-            response = requests.get(page_url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            if "docs" in data:
-                all_data.extend(data["docs"])
-                
-        except requests.exceptions.RequestException as e:
-            print(f"  Warning: Failed to fetch page {page}: {e}")
-            continue
-        
-        if page < pages:
-            time.sleep(delay)
+            table = _to_table(docs)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            parts.append(_normalize_columns(_to_pandas_frame(docs)))
+        else:
+            parts.append(table.rename_columns([_normalize_name(c) for c in table.column_names]))
     
-    df = pd.DataFrame(all_data)
+    if not parts:
+        return pd.DataFrame()
     
-    if df.empty:
-        return df
-    
-    df.columns = (
-        df.columns
-        .str.strip()
-        .str.lower()
-        .str.replace(" ", "_", regex=False)
-        .str.replace("-", "_", regex=False)
-    )
+    if all(isinstance(part, pa.Table) for part in parts):
+        try:
+            table = pa.concat_tables(parts, promote_options="permissive")
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+        else:
+            return table.to_pandas(types_mapper=pd.ArrowDtype)
     
-    return df
+    frames = [
+        part.to_pandas(types_mapper=pd.ArrowDtype) if isinstance(part, pa.Table) else part
+        for part in parts
+    ]
+    return pd.concat(frames, ignore_index=True)
@@ -3,43 +3,178 @@ Data Validator - Validates data against schema and rules.
 """
 
 import re
+import operator
+import functools
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 
 '''
-This method casts columns to the schema-defined types since all of the fields
-returned by the API are Strings. Records that fail type conversion are 
-rejected.
+Builds reject records for every row of a rejected slice. The slice is
+converted to an Arrow table and its rows read with to_pylist, which yields
+plain Python values with None for missing values straight from the column
+buffers, so each raw_payload is ready for JSON serialization without going
+through pandas object columns. Slices Arrow can't represent (columns with
+mixed types) replace missing values with None in pandas instead.
 
 Args:
-    df: Input DataFrame
+    bad_df: DataFrame of rejected rows
+    source_name: Name of the data source for reject tracking
+    reason: Reason shared by all of the rejected rows
+
+Returns:
+    A list of dictionaries containing source_name, raw_payload and reason
+'''
+def collect_rejects(bad_df, source_name, reason):
+    if bad_df.empty:
+        return []
+    try:
+        payloads = pa.Table.from_pandas(bad_df, preserve_index=False).to_pylist()
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        payloads = bad_df.astype(object).where(bad_df.notna(), None).to_dict(orient="records")
+    return [
+        {"source_name": source_name, "raw_payload": payload, "reason": reason}
+        for payload in payloads
+    ]
+
+'''
+Rejected rows of one DataFrame that failed for the same reason. Holds the
+DataFrame and the failure mask instead of reject dictionaries, so rows are
+only built when the loader consumes them and only one batch's rows exist
+at a time.
+
+Args:
+    df: DataFrame the mask was computed on
+    mask: Boolean numpy array, True for rejected rows
     source_name: Name of the data source for reject tracking
+    reason: Reason shared by all of the rejected rows
+'''
+class RejectBatch:
+    
+    def __init__(self, df, mask, source_name, reason):
+        self.df = df
+        self.mask = mask
+        self.source_name = source_name
+        self.reason = reason
+        self._count = int(mask.sum())
+    
+    def __len__(self):
+        return self._count
+    
+    def to_rows(self):
+        return collect_rejects(self.df[self.mask], self.source_name, self.reason)
+
+'''
+Casts columns to their schema types and works out which rows failed. Rows
+are not removed here: each failure is returned as a boolean mask with its
+reason, so callers can combine masks and slice the DataFrame once. A row
+that fails one column is not reported again for later columns. Casts are
+written to a shallow copy, so the input keeps the raw values for the reject
+payloads. With
+downcast set, int columns are then stored in the smallest nullable integer
+type that holds their values (e.g. Int16 for years).
+
+Args:
+    df: Input DataFrame, left unchanged
     schema: Dictionary mapping column names to data types
+    downcast: If True, downcast int columns after casting
 Returns:
-    Tuple of (valid_df, rejects) where rejects is a list of
-    dictionaries containing source_name, raw_payload and reason
+    Tuple of (cast_df, failures) where failures is a list of (mask, reason)
 '''
-def cast_types(df, source_name, schema):
-    rejects = []
+def _cast_failures(df, schema, downcast=False):
+    df = df.copy(deep=False)
+    failures = []
+    failed_any = np.zeros(len(df), dtype=bool)
+    int_columns = []
     
     for col, dtype in schema.items():
         if col not in df.columns:
             continue
             
         if dtype == "int":
-            original = df[col].copy()
-            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
-
-            failed_mask = df[col].isna() & original.notna()
-            for idx in df[failed_mask].index:
-                rejects.append({
-                    "source_name": source_name,
-                    "raw_payload": df.loc[idx].to_dict(),
-                    "reason": f"Failed to cast '{col}' to {dtype}"
-                })
-            df = df[~failed_mask]
+            int_columns.append(col)
+            original = df[col]
+            # Integer and all-null columns cannot fail the cast, so skip the
+            # to_numeric pass and the failure mask for them
+            if pd.api.types.is_integer_dtype(original.dtype) or not original.notna().any():
+                if original.dtype != "Int64":
+                    df[col] = original.astype("Int64")
+                continue
+            
+            df[col] = pd.to_numeric(original, errors="coerce").astype("Int64")
+            
+            failed_mask = (df[col].isna() & original.notna()).to_numpy() & ~failed_any
+            failures.append((failed_mask, f"Failed to cast '{col}' to {dtype}"))
+            failed_any |= failed_mask
+    
+    if downcast:
+        for col in int_columns:
+            df[col] = pd.to_numeric(df[col], downcast="integer")
     
-    return df.copy(), rejects
+    return df, failures
+
+'''
+Evaluates every rule and returns the rows that fail each one as a boolean
+mask with its reason. Rows are not removed here.
+
+Args:
+    df: Input DataFrame
+    rules: List of rule strings to evaluate
+Returns:
+    List of (mask, reason) where mask is True for rows failing the rule
+'''
+def _rule_failures(df, rules):
+    return [(~compile_rule(rule)(df).to_numpy(), f"Failed rule: {rule}") for rule in rules]
+
+'''
+Wraps a list of (mask, reason) failures against the same DataFrame in
+RejectBatch objects, in the order the failures were found. Failures that
+matched no rows are dropped.
+
+Args:
+    df: DataFrame the masks were computed on
+    source_name: Name of the data source for reject tracking
+    failures: List of (mask, reason)
+Returns:
+    A list of RejectBatch
+'''
+def _collect_failures(df, source_name, failures):
+    batches = [RejectBatch(df, mask, source_name, reason) for mask, reason in failures]
+    return [batch for batch in batches if len(batch)]
+
+'''
+Combines failure masks into a single mask of rows that failed any of them
+with one numpy reduction instead of a chain of in-place ORs.
+
+Args:
+    failures: List of (mask, reason)
+    n_rows: Number of rows the masks cover
+Returns:
+    Boolean numpy array, True for rows that failed at least one mask
+'''
+def _failed_rows(failures, n_rows):
+    if not failures:
+        return np.zeros(n_rows, dtype=bool)
+    return np.logical_or.reduce([mask for mask, _ in failures])
+
+'''
+This method casts columns to the schema-defined types since all of the fields
+returned by the API are Strings. Records that fail type conversion are 
+rejected.
+
+Args:
+    df: Input DataFrame
+    source_name: Name of the data source for reject tracking
+    schema: Dictionary mapping column names to data types
+    downcast: If True, store int columns in the smallest integer type
+        that fits their values
+Returns:
+    Tuple of (valid_df, rejects) where rejects is a list of RejectBatch
+'''
+def cast_types(df, source_name, schema, downcast=False):
+    cast_df, failures = _cast_failures(df, schema, downcast)
+    valid_mask = ~_failed_rows(failures, len(df))
+    return cast_df[valid_mask], _collect_failures(df, source_name, failures)
 
 '''
 Apply validation rules to the DataFrame. Evaluates each
@@ -51,30 +186,194 @@ Args:
     rules: List of rule strings to evaluate
 
 Returns:
-    Tuple of (valid_df, rejects) where rejects contains failed rows.
+    Tuple of (valid_df, rejects) where rejects is a list of RejectBatch
+    holding the failed rows.
 '''
 def apply_rules(df, source_name, rules):
-    rejects = []
-    valid_mask = pd.Series(True, index=df.index)
+    failures = _rule_failures(df, rules)
+    valid_mask = ~_failed_rows(failures, len(df))
+    return df[valid_mask], _collect_failures(df, source_name, failures)
+
+# Rule patterns, compiled once at import
+_NOT_NULL_RE = re.compile(r"(\w+)\s+NOT\s+NULL$", re.IGNORECASE)
+_LEN_RE = re.compile(r"len\((\w+)\)\s*(>=|<=|==|!=|>|<)\s*(\d+)$")
+_COMPARE_RE = re.compile(r"(\w+)\s*(>=|<=|==|!=|>|<)\s*(-?\d+(?:\.\d*)?)$")
+
+_OP_MAP = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+
+'''
+Checks whether a column dtype holds strings natively, so the .str accessor
+can be used on it without converting the values first.
+
+Args:
+    dtype: Column dtype
+
+Returns:
+    True for pandas StringDtype and Arrow string or large_string dtypes.
+'''
+def _is_string_dtype(dtype):
+    if isinstance(dtype, pd.StringDtype):
+        return True
+    if not isinstance(dtype, pd.ArrowDtype):
+        return False
+    return pa.types.is_string(dtype.pyarrow_dtype) or pa.types.is_large_string(dtype.pyarrow_dtype)
+
+'''
+Builds the mask function for "col NOT NULL".
+
+Args:
+    col: Column name
+
+Returns:
+    Function returning True for rows where the column has a value.
+'''
+def _not_null_rule(col):
+    return lambda df: df[col].notna()
+
+'''
+Builds the mask function for a length check such as "len(col) > 0". Nulls
+count as length 0.
+
+Args:
+    col: Column name
+    op: Comparison operator symbol, a key of _OP_MAP
+    value: Length to compare against, as a string
+
+Returns:
+    Function returning True for rows whose value's length passes the check.
+'''
+def _len_rule(col, op, value):
+    op_fn, value = _OP_MAP[op], int(value)
+    
+    def mask(df):
+        series = df[col]
+        # String columns are measured directly; nulls count as length 0
+        if _is_string_dtype(series.dtype):
+            return op_fn(series.str.len().fillna(0), value)
+        return op_fn(series.fillna("").astype(str).str.len(), value)
+    
+    return mask
+
+'''
+Builds the mask function for a numeric comparison such as "col >= 1900".
+Values that aren't numeric, and nulls, fail the comparison.
+
+Args:
+    col: Column name
+    op: Comparison operator symbol, a key of _OP_MAP
+    value: Number to compare against, as a string
+
+Returns:
+    Function returning True for rows whose value passes the comparison.
+'''
+def _compare_rule(col, op, value):
+    op_fn, value = _OP_MAP[op], float(value)
+    return lambda df: op_fn(pd.to_numeric(df[col], errors="coerce"), value).fillna(False).astype(bool)
+
+'''
+Mask function for unknown rules.
+
+Args:
+    df: Input DataFrame
+
+Returns:
+    Boolean Series that is True for every row.
+'''
+def _pass_all(df):
+    return pd.Series(True, index=df.index)
+
+# Checked in order; the first pattern that matches handles the rule
+_RULE_BUILDERS = [
+    (_NOT_NULL_RE, _not_null_rule),
+    (_LEN_RE, _len_rule),
+    (_COMPARE_RE, _compare_rule),
+]
+
+'''
+Checks whether a rule token is a number in the form the comparison pattern
+accepts: optional minus sign, digits and an optional fractional part.
+
+Args:
+    value: Rule token
+
+Returns:
+    True if the token is such a number.
+'''
+def _is_number(value):
+    whole, _, fraction = value.removeprefix("-").partition(".")
+    return whole.isdecimal() and (not fraction or fraction.isdecimal())
+
+'''
+Parses a rule written as space-separated tokens ("col NOT NULL",
+"len(col) > 0", "col >= 1900") by looking at the tokens directly instead of
+trying each pattern in turn.
+
+Args:
+    rule: Stripped rule string
+
+Returns:
+    The rule's mask function, or None if the rule isn't in token form.
+'''
+def _parse_rule_tokens(rule):
+    parts = rule.split()
+    if len(parts) != 3:
+        return None
     
-    for rule in rules:
-        mask = evaluate_rule(df, rule)
-        invalid = ~mask
-        
-        for idx in df[invalid].index:
-            rejects.append({
-                "source_name": source_name,
-                "raw_payload": df.loc[idx].to_dict(),
-                "reason": f"Failed rule: {rule}",
-            })
-        valid_mask &= mask
+    left, middle, right = parts
+    if middle.upper() == "NOT" and right.upper() == "NULL" and left.isidentifier():
+        return _not_null_rule(left)
     
-    return df[valid_mask].copy(), rejects
+    if middle in _OP_MAP:
+        if left.startswith("len(") and left.endswith(")"):
+            col = left[4:-1]
+            if col.isidentifier() and right.isdecimal():
+                return _len_rule(col, middle, right)
+        elif left.isidentifier() and _is_number(right):
+            return _compare_rule(left, middle, right)
+    
+    return None
+
+'''
+Parses a validation rule once into a function that returns the rule's
+boolean mask for a DataFrame. Results are cached by rule string, so the
+same rules applied to every page and source are only parsed the first time.
+Supports "col NOT NULL", length checks such as "len(col) > 0" and numeric
+comparisons such as "col >= 1900". Null values fail comparisons. Rules are
+tokenized first; ones not written as space-separated tokens (such as
+"len(col)>0") are matched against the rule patterns. Unknown rules compile
+to a function that passes every row.
+
+Args:
+    rule: Rule string to be compiled
+
+Returns:
+    Function taking a DataFrame and returning a boolean Series.
+'''
+@functools.lru_cache(maxsize=None)
+def compile_rule(rule):
+    rule = rule.strip()
+    compiled = _parse_rule_tokens(rule)
+    if compiled is not None:
+        return compiled
+    
+    for pattern, builder in _RULE_BUILDERS:
+        match = pattern.match(rule)
+        if match:
+            return builder(*match.groups())
+    
+    # Unknown rule - pass all rows
+    return _pass_all
 
 '''
 Evaluates a single validation rule and returns a boolean mask.
-Checks if a field is NOT NULL and checks if the value has a length
-greater than 0. If it observes an unknown rule then it just returns True.
+See compile_rule for the supported rule forms.
 
 Args:
     df: Input DataFrame
@@ -85,43 +384,40 @@ Returns:
 '''
 def evaluate_rule(df, rule):
     """Evaluate a validation rule and return a boolean mask."""
-    rule_upper = rule.upper()
-    
-    if "NOT NULL" in rule_upper:
-        col = rule.split()[0]
-        return df[col].notna()
-    
-    if rule.startswith("len("):
-        col = rule.split("(")[1].split(")")[0]
-        return df[col].fillna("").astype(str).str.len() > 0
-    
-    # Unknown rule - pass all rows
-    return pd.Series([True] * len(df), index=df.index)
+    return compile_rule(rule)(df)
     
 
 '''
 Validate data against schema types and rules. Runs the full validation
-pipeline. Returns all valid and rejected data.
+pipeline. Returns all valid and rejected data. Each step only produces
+masks; the valid rows and the rejects are sliced from the DataFrame once at
+the end instead of copying the surviving rows after every step. The boolean
+slice is already a new DataFrame, so it is returned without a further copy.
+Rows that fail a cast are rejected once and are not checked against the
+rules. Cast rejects carry the row's raw values from before casting; rule
+rejects carry the cast values.
 
 Args:
     df: Input DataFrame
     source_name: Name of the data source for reject tracking
     schema: Dictionary mapping column names to data types.
     rules: List of validation rule strings
+    downcast: If True, store int columns in the smallest integer type
+        that fits their values
 
 Returns:
     Tuple of (valid_df, all_rejects) which contains valid records
-    and all rejected records
+    and all rejected records as a list of RejectBatch
 '''
-def validate_data(df, source_name, schema, rules):
-    all_rejects = []
-    
-    # Cast types
-    df, cast_rejects = cast_types(df, source_name, schema)
-    all_rejects.extend(cast_rejects)
+def validate_data(df, source_name, schema, rules, downcast=False):
+    # Cast types; cast rejects keep the raw values of the input
+    cast_df, cast_failures = _cast_failures(df, schema, downcast)
+    cast_ok = ~_failed_rows(cast_failures, len(df))
     
-    # Apply rules
-    df, rule_rejects = apply_rules(df, source_name, rules)
-    all_rejects.extend(rule_rejects)
+    # Apply rules to rows that cast cleanly
+    rule_failures = [(mask & cast_ok, reason) for mask, reason in _rule_failures(cast_df, rules)]
+    valid_mask = cast_ok & ~_failed_rows(rule_failures, len(df))
     
-    return df, all_rejects
+    rejects = _collect_failures(df, source_name, cast_failures)
+    rejects.extend(_collect_failures(cast_df, source_name, rule_failures))
+    return cast_df[valid_mask], rejects
@@ -7,6 +7,7 @@ from pathlib import Path
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -16,6 +17,7 @@ from clean import (
     filter_columns,
     strip_strings,
     normalize_nulls,
+    strip_and_normalize,
     remove_duplicates,
     clean_data,
 )
@@ -32,6 +34,40 @@ class TestFlattenLists:
         df = pd.DataFrame({"author": ["Mark"]})
         result = flatten_lists(df)
         assert result.loc[0, "author"] == "Mark"
+    
+    def test_flattens_arrow_list_column(self):
+        df = pd.DataFrame({
+            "author": pd.array(
+                [["Mark", "David"], None, []],
+                dtype=pd.ArrowDtype(pa.list_(pa.string())),
+            ),
+        })
+        result = flatten_lists(df)
+        assert result.loc[0, "author"] == "Mark, David"
+        assert pd.isna(result.loc[1, "author"])
+        assert result.loc[2, "author"] == ""
+    
+    def test_arrow_list_of_structs_falls_back_to_python_join(self):
+        df = pd.DataFrame({
+            "extra": pd.array(
+                [[{"x": 1}, {"x": 2}], None],
+                dtype=pd.ArrowDtype(pa.list_(pa.struct([("x", pa.int64())]))),
+            ),
+        })
+        result = flatten_lists(df)
+        assert result.loc[0, "extra"] == "{'x': 1}, {'x': 2}"
+        assert pd.isna(result.loc[1, "extra"])
+    
+    def test_detects_list_column_after_leading_null(self):
+        df = pd.DataFrame({"author": [None, ["Mark", "David"]]})
+        result = flatten_lists(df)
+        assert pd.isna(result.loc[0, "author"])
+        assert result.loc[1, "author"] == "Mark, David"
+    
+    def test_flattens_lists_mixed_with_strings(self):
+        df = pd.DataFrame({"author": ["Mark", ["Mark", "David"], 1]})
+        result = flatten_lists(df)
+        assert result["author"].tolist() == ["Mark", "Mark, David", 1]
 
 
 class TestFilterColumns:
@@ -42,6 +78,12 @@ class TestFilterColumns:
         result = filter_columns(df, schema)
         assert "extra" not in result.columns
         assert "id" in result.columns
+    
+    def test_changes_to_result_do_not_modify_input(self):
+        df = pd.DataFrame({"title": ["  Python  "], "extra": ["remove"]})
+        result = strip_strings(filter_columns(df, {"title": "str"}))
+        assert result.loc[0, "title"] == "Python"
+        assert df.loc[0, "title"] == "  Python  "
 
 
 class TestStripStrings:
@@ -50,6 +92,13 @@ class TestStripStrings:
         df = pd.DataFrame({"title": ["  Python  "]})
         result = strip_strings(df)
         assert result.loc[0, "title"] == "Python"
+    
+    def test_leaves_nan_and_non_strings_unchanged(self):
+        df = pd.DataFrame({"title": ["  Python  ", np.nan, 5]})
+        result = strip_strings(df)
+        assert result.loc[0, "title"] == "Python"
+        assert pd.isna(result.loc[1, "title"])
+        assert result.loc[2, "title"] == 5
 
 
 class TestNormalizeNulls:
@@ -63,6 +112,27 @@ class TestNormalizeNulls:
         df = pd.DataFrame({"title": ["N/A"]})
         result = normalize_nulls(df)
         assert pd.isna(result.loc[0, "title"])
+    
+    def test_leaves_other_values_and_missing_unchanged(self):
+        df = pd.DataFrame({"title": ["Python", None, 5, "null"]})
+        result = normalize_nulls(df)
+        assert result.loc[0, "title"] == "Python"
+        assert pd.isna(result.loc[1, "title"])
+        assert result.loc[2, "title"] == 5
+        assert pd.isna(result.loc[3, "title"])
+
+
+class TestStripAndNormalize:
+    
+    def test_strips_whitespace(self):
+        df = pd.DataFrame({"title": ["  Python  "]})
+        result = strip_and_normalize(df)
+        assert result.loc[0, "title"] == "Python"
+    
+    def test_converts_padded_null_string_to_na(self):
+        df = pd.DataFrame({"title": ["  N/A ", "   ", np.nan]})
+        result = strip_and_normalize(df)
+        assert result["title"].isna().all()
 
 
 class TestRemoveDuplicates:
@@ -72,6 +142,39 @@ class TestRemoveDuplicates:
         result = remove_duplicates(df, ["id"])
         assert len(result) == 1
         assert result.iloc[0]["title"] == "Last"
+    
+    def test_keeps_last_per_string_key_in_order(self):
+        df = pd.DataFrame({"key": ["b", "a", "b", "c"], "title": ["B1", "A", "B2", "C"]})
+        result = remove_duplicates(df, ["key"])
+        assert result["title"].tolist() == ["A", "B2", "C"]
+    
+    def test_keeps_last_per_composite_key(self):
+        df = pd.DataFrame({
+            "key": ["a", "a", "a"],
+            "edition": [1, 2, 1],
+            "title": ["A1", "A2", "A1 again"],
+        })
+        result = remove_duplicates(df, ["key", "edition"])
+        assert result["title"].tolist() == ["A2", "A1 again"]
+        assert result.index.tolist() == [0, 1]
+    
+    def test_keeps_last_per_int_key_in_order(self):
+        df = pd.DataFrame({"id": [2, 1, 2, 3], "title": ["B1", "A", "B2", "C"]})
+        result = remove_duplicates(df, ["id"])
+        assert result["title"].tolist() == ["A", "B2", "C"]
+    
+    def test_keeps_last_per_arrow_string_key(self):
+        df = pd.DataFrame({
+            "key": pd.array(["b", "a", "b"], dtype="string[pyarrow]"),
+            "title": ["B1", "A", "B2"],
+        })
+        result = remove_duplicates(df, ["key"])
+        assert result["title"].tolist() == ["A", "B2"]
+    
+    def test_object_keys_of_different_types_stay_distinct(self):
+        df = pd.DataFrame({"key": [1, "1", 1], "title": ["A", "B", "C"]})
+        result = remove_duplicates(df, ["key"])
+        assert result["title"].tolist() == ["B", "C"]
 
 
 class TestCleanDataIntegration:
@@ -88,4 +191,38 @@ class TestCleanDataIntegration:
         
         assert "extra" not in result.columns
         assert len(result) == 1
-        assert result.iloc[0]["title"] == "Updated"
\ No newline at end of file
+        assert result.iloc[0]["title"] == "Updated"
+    
+    def test_cleans_pyarrow_backed_frame(self):
+        df = pd.DataFrame({
+            "id": [1, 2],
+            "title": ["  Python  ", " N/A "],
+            "author": [["Mark"], ["Mark", "David"]],
+        }).convert_dtypes(dtype_backend="pyarrow")
+        schema = {"id": "int", "title": "str", "author": "str"}
+        result = clean_data(df, schema, ["id"])
+        
+        assert result["title"].tolist()[0] == "Python"
+        assert pd.isna(result.loc[1, "title"])
+        assert result.loc[1, "author"] == "Mark, David"
+    
+    def test_polars_backend_matches_pandas(self):
+        pytest.importorskip("polars")
+        
+        def make_df():
+            return pd.DataFrame({
+                "id": [1, 2, 1],
+                "title": ["  Python  ", " N/A ", "  Updated  "],
+                "author": [["Mark"], None, ["Mark", "David"]],
+                "series": ["Solo", ["A", "B"], 3],
+                "extra": ["remove", "me", "too"],
+            })
+        schema = {"id": "int", "title": "str", "author": "str", "series": "str"}
+        expected = clean_data(make_df(), schema, ["id"])
+        result = clean_data(make_df(), schema, ["id"], backend="polars")
+        
+        def rows(frame):
+            return frame.astype(object).where(frame.notna(), None).values.tolist()
+        
+        assert list(result.columns) == list(expected.columns)
+        assert rows(result) == rows(expected)
@@ -0,0 +1,85 @@
+"""
+Unit tests for load.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from load import (
+    upsert_statement,
+    copy_statements,
+    sql_clean_statements,
+)
+
+
+def squash(sql):
+    return " ".join(sql.split())
+
+
+class TestUpsertStatement:
+    
+    def test_builds_insert_on_conflict(self):
+        statement = upsert_statement("stg_books", ("key", "title", "year"), ("key",))
+        assert squash(statement.text) == (
+            "INSERT INTO stg_books (key, title, year) "
+            "VALUES (:key, :title, :year) "
+            "ON CONFLICT (key) DO UPDATE SET title = EXCLUDED.title, year = EXCLUDED.year"
+        )
+    
+    def test_returns_cached_statement(self):
+        first = upsert_statement("stg_books", ("key", "title"), ("key",))
+        assert upsert_statement("stg_books", ("key", "title"), ("key",)) is first
+
+
+class TestCopyStatements:
+    
+    def test_builds_temp_table_copy_and_ordered_upsert(self):
+        create, copy, insert, drop = copy_statements("stg_books", ("key", "title"), ("key",))
+        assert create == (
+            "CREATE TEMP TABLE tmp_stg_books (LIKE stg_books INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        assert copy == "COPY tmp_stg_books (key, title) FROM STDIN"
+        assert squash(insert) == (
+            "INSERT INTO stg_books (key, title) "
+            "SELECT key, title FROM tmp_stg_books "
+            "ORDER BY key "
+            "ON CONFLICT (key) DO UPDATE SET title = EXCLUDED.title"
+        )
+        assert drop == "DROP TABLE tmp_stg_books"
+    
+    def test_composite_key_is_excluded_from_update(self):
+        _, _, insert, _ = copy_statements("t", ("a", "b", "c"), ("a", "b"))
+        assert "ON CONFLICT (a, b) DO UPDATE SET c = EXCLUDED.c" in squash(insert)
+
+
+class TestSqlCleanStatements:
+    
+    def test_builds_raw_text_staging_table(self):
+        create, copy, _, drop = sql_clean_statements(
+            "stg_books", ("key", "year"), ("key",), ("str", "int")
+        )
+        assert create == (
+            "CREATE TEMP TABLE raw_stg_books "
+            "(key TEXT, year TEXT, _ingest_seq BIGINT) ON COMMIT DROP"
+        )
+        assert copy == "COPY raw_stg_books (key, year, _ingest_seq) FROM STDIN"
+        assert drop == "DROP TABLE raw_stg_books"
+    
+    def test_trims_nulls_casts_and_keeps_last_row_per_key(self):
+        _, _, insert, _ = sql_clean_statements(
+            "stg_books", ("key", "year", "note"), ("key",), ("str", "int", None)
+        )
+        nulls = "'', 'nan', 'None', 'none', 'null', 'NULL', 'N/A', 'n/a', 'NA'"
+        assert squash(insert) == (
+            "INSERT INTO stg_books (key, year, note) "
+            "SELECT DISTINCT ON (key) key, year, note "
+            "FROM (SELECT "
+            f"CAST(CASE WHEN TRIM(key) IN ({nulls}) THEN NULL ELSE TRIM(key) END AS TEXT) AS key, "
+            f"CAST(CASE WHEN TRIM(year) IN ({nulls}) THEN NULL ELSE TRIM(year) END AS INTEGER) AS year, "
+            f"CAST(CASE WHEN TRIM(note) IN ({nulls}) THEN NULL ELSE TRIM(note) END AS TEXT) AS note, "
+            "_ingest_seq FROM raw_stg_books) AS cleaned "
+            "ORDER BY key, _ingest_seq DESC "
+            "ON CONFLICT (key) DO UPDATE SET year = EXCLUDED.year, note = EXCLUDED.note"
+        )
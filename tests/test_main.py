@@ -0,0 +1,136 @@
+"""
+Unit tests for main.py
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import main
+from main import _prefetch, _process_source
+
+
+class TestPrefetch:
+    
+    def test_yields_items_in_order(self):
+        assert list(_prefetch(iter(range(5)))) == [0, 1, 2, 3, 4]
+    
+    def test_reraises_producer_errors(self):
+        def failing():
+            yield 1
+            raise ValueError("page failed")
+        
+        items = _prefetch(failing())
+        assert next(items) == 1
+        with pytest.raises(ValueError, match="page failed"):
+            next(items)
+    
+    def test_runs_at_most_maxsize_ahead(self):
+        requested = [threading.Event() for _ in range(6)]
+        
+        def source():
+            for i in range(6):
+                requested[i].set()
+                yield i
+        
+        items = _prefetch(source(), maxsize=2)
+        assert next(items) == 0
+        # Items 1 and 2 fill the buffer, so the producer waits to put item 3
+        assert requested[3].wait(timeout=5)
+        assert not requested[4].is_set()
+        
+        assert next(items) == 1
+        assert requested[4].wait(timeout=5)
+        items.close()
+    
+    def test_stops_producer_when_consumer_exits(self):
+        closed = threading.Event()
+        
+        def source():
+            try:
+                for i in range(100):
+                    yield i
+            finally:
+                closed.set()
+        
+        items = _prefetch(source(), maxsize=1)
+        assert next(items) == 0
+        items.close()
+        assert closed.wait(timeout=5)
+
+
+class TestProcessSource:
+    
+    SOURCE = {
+        "name": "books",
+        "path": "url",
+        "target_table": "stg_books",
+        "pk": ["key"],
+        "schema": {"key": "str", "title": "str"},
+        "rules": ["len(title) > 0"],
+    }
+    CONFIG = {
+        "batch_size": 5000,
+        "copy_threshold": 1024,
+        "clean_backend": "pandas",
+        "downcast_numeric": False,
+    }
+    
+    @pytest.fixture
+    def engine(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'pipeline.db'}")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE stg_books (key TEXT PRIMARY KEY, title TEXT)"))
+            conn.execute(text(
+                "CREATE TABLE stg_rejects (id INTEGER PRIMARY KEY, source_name TEXT, raw_payload TEXT, reason TEXT)"
+            ))
+        yield engine
+        engine.dispose()
+    
+    def test_validates_each_page_on_its_own(self, engine, monkeypatch):
+        frames = [
+            pd.DataFrame({"key": ["a", "b"], "title": ["A1", "B1"]}),
+            pd.DataFrame({"key": ["a", "b"], "title": ["", "B2"]}),
+        ]
+        monkeypatch.setattr(main, "fetch_data_iter", lambda path, pages=1: iter(frames))
+        
+        stats = _process_source(self.SOURCE, engine, self.CONFIG)
+        
+        # The failing second version of "a" is rejected, but its valid first
+        # version is still loaded; both versions of "b" are merged into one row
+        assert stats == {"input": 4, "valid": 3, "rejected": 1, "inserted": 2, "succeeded": True}
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT key, title FROM stg_books ORDER BY key")).all()
+            rejects = conn.execute(text("SELECT count(*) FROM stg_rejects")).scalar()
+        assert rows == [("a", "A1"), ("b", "B2")]
+        assert rejects == 1
+    
+    def test_buffers_pages_until_copy_threshold(self, engine, monkeypatch):
+        frames = [
+            pd.DataFrame({"key": ["a", "b"], "title": ["A", "B"]}),
+            pd.DataFrame({"key": ["c"], "title": ["C"]}),
+            pd.DataFrame({"key": ["d"], "title": ["D"]}),
+        ]
+        copied = []
+        
+        # SQLite has no COPY, so only record what would have been copied
+        def load_data_copy(df, engine, table, pk, conn=None):
+            copied.append(df["key"].tolist())
+            return len(df)
+        
+        monkeypatch.setattr(main, "fetch_data_iter", lambda path, pages=1: iter(frames))
+        monkeypatch.setattr(main, "load_data_copy", load_data_copy)
+        
+        stats = _process_source(self.SOURCE, engine, {**self.CONFIG, "copy_threshold": 3})
+        
+        assert copied == [["a", "b", "c"]]
+        assert stats["inserted"] == 4
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT key FROM stg_books")).scalars().all()
+        assert rows == ["d"]
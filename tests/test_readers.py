@@ -0,0 +1,126 @@
+"""
+Unit tests for readers/api_reader.py
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import readers.api_reader as api_reader
+from readers.api_reader import (
+    ARROW_STRING,
+    MAX_PAGE_WORKERS,
+    _normalize_name,
+    _throttle,
+    _to_frame,
+    fetch_data,
+    fetch_data_iter,
+)
+
+
+class TestNormalizeName:
+    
+    def test_lowercases_and_replaces_spaces(self):
+        assert _normalize_name(" Edition Count ") == "edition_count"
+    
+    def test_collapses_runs_of_spaces_and_dashes(self):
+        assert _normalize_name("First - Name") == "first_name"
+        assert _normalize_name("author--key") == "author_key"
+
+
+class TestToFrame:
+    
+    def test_builds_arrow_columns(self):
+        df = _to_frame([{"title": "A", "author": ["X", "Y"]}, {"title": "B", "extra": 1}])
+        assert df["title"].dtype == ARROW_STRING
+        assert pa.types.is_list(df["author"].dtype.pyarrow_dtype)
+        assert df["extra"].isna().tolist() == [True, False]
+    
+    def test_mixed_types_fall_back_to_pandas(self):
+        df = _to_frame([{"title": "A", "year": 2020}, {"title": None, "year": "2021"}])
+        assert df["title"].dtype == ARROW_STRING
+        assert df["year"].dtype == object
+        assert df["year"].tolist() == [2020, "2021"]
+
+
+class TestThrottle:
+    
+    def test_spaces_out_calls(self, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr(api_reader, "_next_start", 0.0)
+        monkeypatch.setattr(api_reader.time, "monotonic", lambda: 100.0)
+        monkeypatch.setattr(api_reader.time, "sleep", sleeps.append)
+        for _ in range(3):
+            _throttle(0.05)
+        assert sleeps == pytest.approx([0.0, 0.05, 0.1])
+
+
+class TestFetchDataIter:
+    
+    def test_yields_pages_in_order_and_skips_empty_ones(self, monkeypatch):
+        pages = {1: [{"Key": "a"}], 3: [{"Key": "c"}]}
+        monkeypatch.setattr(api_reader, "_fetch_page", lambda url, page, total: pages.get(page, []))
+        frames = list(fetch_data_iter("url", pages=3, delay=0))
+        assert [frame["key"].tolist() for frame in frames] == [["a"], ["c"]]
+    
+    def test_fetches_at_most_a_window_ahead(self, monkeypatch):
+        requested = []
+        started = threading.Semaphore(0)
+        release = threading.Event()
+        
+        def fetch_page(url, page, total):
+            requested.append(page)
+            started.release()
+            # Later pages block until the test has checked the window
+            if page > 1:
+                release.wait(timeout=5)
+            return [{"key": page}]
+        
+        monkeypatch.setattr(api_reader, "_fetch_page", fetch_page)
+        pages = fetch_data_iter("url", pages=10, delay=0)
+        next(pages)
+        for _ in range(MAX_PAGE_WORKERS):
+            assert started.acquire(timeout=5)
+        assert sorted(requested) == list(range(1, MAX_PAGE_WORKERS + 1))
+        release.set()
+        pages.close()
+
+
+class TestFetchData:
+    
+    def test_concatenates_pages_with_missing_columns(self, monkeypatch):
+        pages = {
+            1: [{"Key": "a", "Edition Count": 1}],
+            2: [{"Key": "b", "Language": "eng"}],
+        }
+        monkeypatch.setattr(api_reader, "_fetch_page", lambda url, page, total: pages.get(page, []))
+        df = fetch_data("url", pages=2, delay=0)
+        assert list(df.columns) == ["key", "edition_count", "language"]
+        assert df["key"].tolist() == ["a", "b"]
+        assert df["edition_count"].isna().tolist() == [False, True]
+        assert df["key"].dtype == ARROW_STRING
+    
+    def test_merges_keys_that_normalize_to_the_same_name(self, monkeypatch):
+        pages = {1: [{"Title": "a", "n": 1}], 2: [{"title": "b", "n": 2}]}
+        monkeypatch.setattr(api_reader, "_fetch_page", lambda url, page, total: pages.get(page, []))
+        df = fetch_data("url", pages=2, delay=0)
+        assert list(df.columns) == ["title", "n"]
+        assert df["title"].tolist() == ["a", "b"]
+    
+    def test_falls_back_to_pandas_when_pages_disagree(self, monkeypatch):
+        pages = {1: [{"key": "a", "year": 2020}], 2: [{"key": "b", "year": "unknown"}]}
+        monkeypatch.setattr(api_reader, "_fetch_page", lambda url, page, total: pages.get(page, []))
+        df = fetch_data("url", pages=2, delay=0)
+        assert df["key"].tolist() == ["a", "b"]
+        assert df["year"].tolist() == [2020, "unknown"]
+    
+    def test_returns_empty_frame_when_no_page_has_records(self, monkeypatch):
+        pages = {}
+        monkeypatch.setattr(api_reader, "_fetch_page", lambda url, page, total: pages.get(page, []))
+        assert fetch_data("url", pages=2, delay=0).empty
@@ -12,13 +12,46 @@ import pytest
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from validate import (
+    collect_rejects,
+    RejectBatch,
     cast_types,
     apply_rules,
+    compile_rule,
     evaluate_rule,
     validate_data,
 )
 
 
+class TestCollectRejects:
+    
+    def test_builds_one_reject_per_row_with_none_for_missing(self):
+        df = pd.DataFrame({"title": ["Python", np.nan], "year": [2020, 2021]})
+        rejects = collect_rejects(df, "test", "bad row")
+        assert len(rejects) == 2
+        assert rejects[1] == {
+            "source_name": "test",
+            "raw_payload": {"title": None, "year": 2021},
+            "reason": "bad row",
+        }
+    
+    def test_mixed_type_column_falls_back_to_pandas(self):
+        df = pd.DataFrame({"year": [2020, "unknown", None]})
+        rejects = collect_rejects(df, "test", "bad row")
+        assert [r["raw_payload"]["year"] for r in rejects] == [2020, "unknown", None]
+
+
+class TestRejectBatch:
+    
+    def test_counts_masked_rows_and_builds_them_on_demand(self):
+        df = pd.DataFrame({"title": ["Python", None, "Go"]})
+        batch = RejectBatch(df, np.array([False, True, True]), "test", "bad row")
+        assert len(batch) == 2
+        assert batch.to_rows() == [
+            {"source_name": "test", "raw_payload": {"title": None}, "reason": "bad row"},
+            {"source_name": "test", "raw_payload": {"title": "Go"}, "reason": "bad row"},
+        ]
+
+
 class TestCastTypes:
     
     def test_casts_string_to_int(self):
@@ -33,6 +66,24 @@ class TestCastTypes:
         result, rejects = cast_types(df, "test", schema)
         assert len(result) == 1
         assert len(rejects) == 1
+    
+    def test_integer_and_all_null_columns_cast_without_rejects(self):
+        df = pd.DataFrame({
+            "year": pd.array([2020, 2021], dtype="int64[pyarrow]"),
+            "count": [None, None],
+        })
+        schema = {"year": "int", "count": "int"}
+        result, rejects = cast_types(df, "test", schema)
+        assert result["year"].dtype == "Int64"
+        assert result["count"].dtype == "Int64"
+        assert len(result) == 2
+        assert rejects == []
+    
+    def test_downcasts_int_columns_when_enabled(self):
+        df = pd.DataFrame({"year": ["2020", "1999", None]})
+        result, rejects = cast_types(df, "test", {"year": "int"}, downcast=True)
+        assert result["year"].dtype == "Int16"
+        assert result["year"].tolist()[:2] == [2020, 1999]
 
 
 class TestEvaluateRule:
@@ -48,6 +99,43 @@ class TestEvaluateRule:
         mask = evaluate_rule(df, "len(title) > 0")
         assert mask.iloc[0] == True
         assert mask.iloc[1] == False
+    
+    def test_len_on_string_dtype_treats_null_as_empty(self):
+        df = pd.DataFrame({"title": pd.array(["Python", "", None], dtype="string[pyarrow]")})
+        mask = evaluate_rule(df, "len(title) > 0")
+        assert mask.tolist() == [True, False, False]
+    
+    def test_len_with_threshold(self):
+        df = pd.DataFrame({"title": ["Python", "Go", None]})
+        mask = evaluate_rule(df, "len(title) >= 3")
+        assert mask.tolist() == [True, False, False]
+    
+    def test_numeric_comparison(self):
+        df = pd.DataFrame({"year": pd.array([1850, 2020, None], dtype="Int64")})
+        mask = evaluate_rule(df, "year >= 1900")
+        assert mask.tolist() == [False, True, False]
+    
+    def test_unknown_rule_passes_all_rows(self):
+        df = pd.DataFrame({"title": ["Python", None]})
+        mask = evaluate_rule(df, "title MATCHES something")
+        assert mask.all()
+
+
+class TestCompileRule:
+    
+    def test_returns_same_function_for_repeated_rule(self):
+        assert compile_rule("len(title) > 0") is compile_rule("len(title) > 0")
+    
+    def test_compiled_rule_builds_mask(self):
+        df = pd.DataFrame({"title": ["Python", None]})
+        mask = compile_rule("title NOT NULL")(df)
+        assert mask.tolist() == [True, False]
+    
+    def test_rules_without_spaces_use_pattern_fallback(self):
+        df = pd.DataFrame({"title": ["Python", ""], "year": ["2020", "-5.5"]})
+        assert compile_rule("len(title)>0")(df).tolist() == [True, False]
+        assert compile_rule("year>=-5.5")(df).tolist() == [True, True]
+        assert compile_rule("year > -1")(df).tolist() == [True, False]
 
 
 class TestApplyRules:
@@ -74,4 +162,37 @@ class TestValidateDataIntegration:
         # Row 0: passes (title has length, year casts fine)
         # Row 1: fails cast (invalid year) - removed before rules
         assert len(valid_df) == 1
-        assert len(rejects) == 1
\ No newline at end of file
+        assert len(rejects) == 1
+    
+    def test_rows_failing_cast_are_not_rejected_again_by_rules(self):
+        df = pd.DataFrame({
+            "title": ["Python", "", ""],
+            "year": ["2020", "invalid", "2021"],
+        })
+        schema = {"title": "str", "year": "int"}
+        rules = ["len(title) > 0", "year NOT NULL"]
+        
+        valid_df, rejects = validate_data(df, "test", schema, rules)
+        
+        assert valid_df["title"].tolist() == ["Python"]
+        assert [batch.reason for batch in rejects] == [
+            "Failed to cast 'year' to int",
+            "Failed rule: len(title) > 0",
+        ]
+    
+    def test_cast_rejects_keep_raw_values(self):
+        df = pd.DataFrame({"year": ["bad", "2020"], "count": ["x", "3"]})
+        schema = {"year": "int", "count": "int"}
+        
+        valid_df, rejects = validate_data(df, "test", schema, [])
+        
+        assert valid_df["count"].tolist() == [3]
+        payloads = [r["raw_payload"] for batch in rejects for r in batch.to_rows()]
+        assert payloads == [{"year": "bad", "count": "x"}]
+        assert df["count"].tolist() == ["x", "3"]
+    
+    def test_no_casts_or_rules_keeps_all_rows(self):
+        df = pd.DataFrame({"title": ["Python", ""]})
+        valid_df, rejects = validate_data(df, "test", {"title": "str"}, [])
+        assert len(valid_df) == 2
+        assert rejects == []